@@ -8,16 +8,37 @@
 import sys
 import re
 import os
+import io
+import csv
+import copy
+import json
+import time
+import hashlib
+import zipfile
+import datetime
+import queue
+import shutil
+import signal
+import pathlib
+import tempfile
+import itertools
+import threading
 import subprocess
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTextEdit, QLabel, QLineEdit, QComboBox, QSpinBox, QPushButton,
     QFileDialog, QMessageBox, QGroupBox, QFormLayout, QCheckBox,
-    QStatusBar, QToolBar, QFrame, QDoubleSpinBox
+    QStatusBar, QToolBar, QFrame, QDoubleSpinBox, QDialog, QDialogButtonBox,
+    QListWidget, QListWidgetItem, QGridLayout, QProgressDialog, QTabWidget
+)
+from PyQt6.QtCore import Qt, QSettings, QStandardPaths, QTimer, QObject, QLockFile, pyqtSignal
+from PyQt6.QtGui import (
+    QFont, QAction, QKeySequence, QDragEnterEvent, QDropEvent, QTextCursor,
+    QTextCharFormat, QColor
 )
-from PyQt6.QtCore import Qt, QSettings
-from PyQt6.QtGui import QFont, QAction, QKeySequence, QDragEnterEvent, QDropEvent
 
 from pptx import Presentation
 from pptx.util import Pt, Inches, Emu
@@ -42,6 +63,1318 @@ def get_rgb_color(color_tuple):
     return RGBColor(color_tuple[0], color_tuple[1], color_tuple[2])
 
 
+def get_app_data_dir():
+    """程序数据目录 (自动保存日志等)"""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+    path = os.path.join(base or os.path.expanduser("~"), "PPTGenerator")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+# ==================== 自动保存日志 ====================
+class AutosaveJournal:
+    """
+    追加式编辑日志 (后台线程写盘)
+    每行一条 JSON: 快照 {"t": "snap", "text": ...} 或增量 {"t": "ed", "p": 位置, "r": 删除数, "a": 插入文本}
+    位置和删除数沿用 Qt 的 UTF-16 计数 (emoji 等非 BMP 字符占 2)，重放时也按 UTF-16 处理
+    GUI 线程只负责入队，写盘、合并批次、压缩都在后台线程完成
+    每个进程写自己的日志，并用同名 .lock 标记所属进程；进程退出后锁失效，日志才会被当作遗留内容恢复
+    """
+
+    FLUSH_INTERVAL = 1.0        # 批量写盘间隔 (秒)
+    COMPACT_MIN_CHARS = 256 * 1024
+    COMPACT_MAX_EDITS = 5000
+    REPLAY_CHUNK = 64 * 1024    # 重放时按块存放文本 (字节)，单次编辑只改动所在的块
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._edits = 0
+        self._chars = 0
+        self._thread = threading.Thread(target=self._run, name="AutosaveJournal", daemon=True)
+        self._lock = QLockFile(os.path.splitext(path)[0] + ".lock")
+        self._lock.setStaleLockTime(0)  # 只按进程是否存活判断，不按锁文件时间
+
+    @classmethod
+    def for_process(cls, directory):
+        return cls(os.path.join(directory, f"autosave-{os.getpid()}.journal"))
+
+    @classmethod
+    def claim_orphan(cls, directory):
+        """
+        按修改时间从新到旧查找所属进程已退出的日志，返回 (日志, 恢复文本)，没有则返回 None
+        返回的日志仍持有锁 (其他窗口不会重复恢复)，处理完后调用 close(discard=True) 删除
+        空日志直接删除；更旧的遗留日志留到下次启动再询问
+        """
+        def mtime(entry):
+            try:
+                return entry.stat().st_mtime
+            except OSError:
+                return 0
+
+        try:
+            entries = [e for e in os.scandir(directory)
+                       if e.name.startswith("autosave-") and e.name.endswith(".journal")]
+        except OSError:
+            return None
+        for entry in sorted(entries, key=mtime, reverse=True):
+            journal = cls(entry.path)
+            if not journal._lock.tryLock(0):
+                continue  # 所属窗口仍在运行
+            text = cls.recover(entry.path)
+            if text:
+                return journal, text
+            journal.close(discard=True)
+        return None
+    @staticmethod
+    def recover(path):
+        """重放日志，返回未保存的文本 (无日志或为空时返回 None)"""
+        if not os.path.exists(path):
+            return None
+        chunks = [bytearray()]  # UTF-16-LE，每个码元 2 字节
+        size = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        break  # 崩溃时最后一行可能只写了一半
+                    if rec.get("t") == "snap":
+                        chunks = AutosaveJournal._split(bytearray(rec["text"].encode('utf-16-le', 'surrogatepass')))
+                        size = sum(len(c) for c in chunks)
+                    elif rec.get("t") == "ed":
+                        start = min(rec["p"] * 2, size)
+                        end = min(start + rec["r"] * 2, size)
+                        added = rec["a"].encode('utf-16-le', 'surrogatepass')
+                        AutosaveJournal._replace(chunks, start, end, added)
+                        size += len(added) - (end - start)
+        except OSError as e:
+            print(f"自动保存恢复警告: {e}")
+            return None
+        text = b"".join(chunks).decode('utf-16-le', 'surrogatepass')
+        return text if text.strip() else None
+
+    @staticmethod
+    def _split(buf):
+        step = AutosaveJournal.REPLAY_CHUNK
+        if len(buf) <= 2 * step:
+            return [buf]
+        return [buf[i:i + step] for i in range(0, len(buf), step)]
+
+    @staticmethod
+    def _replace(chunks, start, end, added):
+        """把 [start, end) 字节替换为 added，只拼接涉及的块，耗时与块大小而非全文长度成正比"""
+        i = 0
+        offset = 0
+        while i < len(chunks) - 1 and offset + len(chunks[i]) <= start:
+            offset += len(chunks[i])
+            i += 1
+        j = i
+        last = offset
+        while j < len(chunks) - 1 and last + len(chunks[j]) < end:
+            last += len(chunks[j])
+            j += 1
+        buf = chunks[i] if i == j else bytearray().join(chunks[i:j + 1])
+        buf[start - offset:end - offset] = added
+        chunks[i:j + 1] = AutosaveJournal._split(buf)
+
+    def start(self, text=""):
+        self._lock.tryLock(0)
+        self.snapshot(text)
+        self._thread.start()
+
+    def track(self, doc):
+        """跟踪 QTextDocument 的编辑"""
+        doc.contentsChange.connect(lambda pos, removed, added: self._on_contents_change(doc, pos, removed, added))
+
+    def _on_contents_change(self, doc, pos, removed, added):
+        """只取变化部分的文本，开销与编辑量成正比"""
+        doc_len = doc.characterCount() - 1  # 去掉末尾隐含的段落符
+        end = min(pos + added, doc_len)
+        text = ""
+        if end > pos:
+            cursor = QTextCursor(doc)
+            cursor.setPosition(pos)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            text = cursor.selectedText().replace('\u2029', '\n')
+        self.record(pos, removed, text)
+        if self.needs_compact(doc_len):
+            self.snapshot(doc.toPlainText())
+
+    def record(self, pos, removed, added):
+        """记录一次编辑 (GUI 线程调用，只入队不写盘)"""
+        self._queue.put({"t": "ed", "p": pos, "r": removed, "a": added})
+        self._edits += 1
+        self._chars += len(added) + removed
+
+    def needs_compact(self, doc_len):
+        """增量累计超过文档本身大小时压缩，写盘开销按编辑量摊销"""
+        return (self._edits >= self.COMPACT_MAX_EDITS
+                or self._chars >= max(self.COMPACT_MIN_CHARS, doc_len))
+
+    def snapshot(self, text):
+        """写入完整快照并丢弃之前的增量"""
+        self._queue.put({"t": "snap", "text": text})
+        self._edits = 0
+        self._chars = 0
+
+    def close(self, discard=False):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=5)
+        if discard:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self._lock.unlock()
+
+    def _run(self):
+        while True:
+            stopping = self._stop.wait(self.FLUSH_INTERVAL)
+            self._flush()
+            if stopping:
+                break
+
+    def _flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return
+
+        # 最后一个快照之前的记录都已过时
+        snap_idx = None
+        for i, rec in enumerate(batch):
+            if rec["t"] == "snap":
+                snap_idx = i
+        try:
+            if snap_idx is not None:
+                tmp = self.path + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    self._write_records(f, batch[snap_idx:])
+                os.replace(tmp, self.path)
+            else:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    self._write_records(f, batch)
+        except OSError as e:
+            print(f"自动保存警告: {e}")
+
+    @staticmethod
+    def _write_records(f, records):
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+# ==================== PPT 生成 ====================
+def clean_markdown(text: str) -> str:
+    """彻底清理 Markdown"""
+    # 标题 # 符号
+    text = re.sub(r'^[ \t]*#{1,6}[ \t]+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^[ \t]*#{1,6}[ \t]*$', '', text, flags=re.MULTILINE)
+
+    # 加粗斜体
+    text = re.sub(r'\*\*\*(.+?)\*\*\*', r'\1', text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
+    text = re.sub(r'___(.+?)___', r'\1', text)
+    text = re.sub(r'__(.+?)__', r'\1', text)
+    text = re.sub(r'(?<![*])\*([^*\n]+?)\*(?![*])', r'\1', text)
+    text = re.sub(r'(?<![_])_([^_\n]+?)_(?![_])', r'\1', text)
+
+    # 删除线、代码
+    text = re.sub(r'~~(.+?)~~', r'\1', text)
+    text = re.sub(r'`([^`\n]+?)`', r'\1', text)
+
+    # 链接、图片
+    text = re.sub(r'\[([^\]]+?)\]\([^)]+?\)', r'\1', text)
+    text = re.sub(r'!\[([^\]]*?)\]\([^)]+?\)', r'\1', text)
+
+    # 列表符号
+    text = re.sub(r'^[ \t]*[\*\-\+][ \t]+', '• ', text, flags=re.MULTILINE)
+    text = re.sub(r'^[ \t]*\d+\.[ \t]+', '', text, flags=re.MULTILINE)
+
+    # 引用、代码块
+    text = re.sub(r'^[ \t]*>+[ \t]*', '', text, flags=re.MULTILINE)
+    text = re.sub(r'^```.*$', '', text, flags=re.MULTILINE)
+
+    # 多余空行
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text
+
+
+def set_run_font(run, cn_font, latin_font, size, color=None, bold=False):
+    """设置文字样式"""
+    run.font.size = Pt(size)
+    run.font.bold = bold
+    if color:
+        run.font.color.rgb = get_rgb_color(color)
+
+    try:
+        rPr = run._r.get_or_add_rPr()
+
+        # 拉丁字体
+        latin = rPr.find(qn('a:latin'))
+        if latin is None:
+            latin = etree.SubElement(rPr, qn('a:latin'))
+        latin.set('typeface', latin_font)
+
+        # 东亚字体
+        ea = rPr.find(qn('a:ea'))
+        if ea is None:
+            ea = etree.SubElement(rPr, qn('a:ea'))
+        ea.set('typeface', cn_font)
+
+        # 复杂脚本
+        cs = rPr.find(qn('a:cs'))
+        if cs is None:
+            cs = etree.SubElement(rPr, qn('a:cs'))
+        cs.set('typeface', latin_font)
+    except:
+        run.font.name = cn_font
+
+
+# 文字分类区间表 (起点, 终点, 类别)，按起点排序；预先编译成正则，运行时不逐字查 unicodedata
+SCRIPT_RANGES = [
+    (0x0030, 0x0039, "latin"), (0x0041, 0x005A, "latin"), (0x0061, 0x007A, "latin"),
+    (0x00C0, 0x00D6, "latin"), (0x00D8, 0x00F6, "latin"), (0x00F8, 0x024F, "latin"),
+    (0x0370, 0x04FF, "latin"),
+    (0x200D, 0x200D, "emoji"),
+    (0x20E3, 0x20E3, "emoji"),
+    (0x2600, 0x27BF, "emoji"), (0x2B00, 0x2BFF, "emoji"),
+    (0x2E80, 0x2FDF, "cjk"),
+    (0x3000, 0x303F, "punct"),
+    (0x3040, 0x31FF, "cjk"), (0x3400, 0x4DBF, "cjk"), (0x4E00, 0x9FFF, "cjk"),
+    (0xA960, 0xA97F, "cjk"), (0xAC00, 0xD7AF, "cjk"), (0xF900, 0xFAFF, "cjk"),
+    (0xFE0F, 0xFE0F, "emoji"),
+    (0xFE10, 0xFE1F, "punct"), (0xFE30, 0xFE4F, "punct"),
+    (0xFF01, 0xFF0F, "punct"), (0xFF10, 0xFF19, "cjk"), (0xFF1A, 0xFF20, "punct"),
+    (0xFF21, 0xFF3A, "cjk"), (0xFF3B, 0xFF40, "punct"), (0xFF41, 0xFF5A, "cjk"),
+    (0xFF5B, 0xFF65, "punct"), (0xFF66, 0xFFDC, "cjk"), (0xFFE0, 0xFFEE, "punct"),
+    (0x1F000, 0x1FAFF, "emoji"),
+    (0x20000, 0x2FA1F, "cjk"), (0x30000, 0x3134F, "cjk"),
+    (0xE0020, 0xE007F, "emoji"),
+]
+EMOJI_FONT = "Segoe UI Emoji"
+_QN_T = qn('a:t')
+_QN_RPR = qn('a:rPr')
+_QN_TYPEFACES = (qn('a:latin'), qn('a:ea'), qn('a:cs'))
+
+
+def _build_script_re(ranges):
+    # 基字符后跟 FE0F/20E3 (如键帽 1️⃣、™️) 时整体归入 emoji；emoji 放在最前，其余类别不吞这类基字符
+    mods = "\\ufe0f\\u20e3"
+    classes = {"emoji": []}
+    for start, end, cls in ranges:
+        classes.setdefault(cls, []).append(f"\\U{start:08x}-\\U{end:08x}")
+    groups = []
+    for cls, parts in classes.items():
+        chars = f"[{''.join(parts)}]"
+        if cls == "emoji":
+            groups.append(f"(?P<emoji>(?:.[{mods}]+|{chars})+)")
+        else:
+            groups.append(f"(?P<{cls}>(?:{chars}(?![{mods}]))+)")
+    return re.compile("|".join(groups))
+
+
+_SCRIPT_RE = _build_script_re(SCRIPT_RANGES)
+
+
+def _neutral_class(gap, prev, nxt):
+    """
+    中性字符 (空格、半角标点、弯引号、破折号、省略号等) 随两侧文字归类
+    两侧相同时取该类；弯引号等宽度随字体变化的符号挨着中文时用中文字体；
+    其余情况优先并入前一段，但不并入 emoji，找不到时按西文处理
+    """
+    if prev == nxt and prev is not None:
+        return prev
+    if not gap.isascii():
+        for cls in (prev, nxt):
+            if cls in ("cjk", "punct"):
+                return cls
+    for cls in (prev, nxt):
+        if cls is not None and cls != "emoji":
+            return cls
+    return "latin"
+
+
+def segment_by_script(text: str) -> list:
+    """
+    按文字类别切分: cjk / latin (含数字) / punct (全角标点) / emoji
+    中性字符按两侧文字归类，见 _neutral_class
+    """
+    if text.isascii():
+        return [("latin", text)] if text else []
+    segs = []
+    last = 0
+    for m in _SCRIPT_RE.finditer(text):
+        cls = m.lastgroup
+        start = m.start()
+        if start > last:
+            gap = text[last:start]
+            gap_cls = _neutral_class(gap, segs[-1][0] if segs else None, cls)
+            if segs and segs[-1][0] == gap_cls:
+                segs[-1][1] += gap
+            else:
+                segs.append([gap_cls, gap])
+        if segs and segs[-1][0] == cls:
+            segs[-1][1] += m.group()
+        else:
+            segs.append([cls, m.group()])
+        last = m.end()
+    if last < len(text):
+        gap = text[last:]
+        gap_cls = _neutral_class(gap, segs[-1][0] if segs else None, None)
+        if segs and segs[-1][0] == gap_cls:
+            segs[-1][1] += gap
+        else:
+            segs.append([gap_cls, gap])
+    return [tuple(seg) for seg in segs]
+
+
+def style_paragraph_runs(para, cn_font, latin_font, size, color=None, bold=False):
+    """按文字类别重建段落的 run，并为每段显式指定字体"""
+    runs = list(para.runs)
+    fonts = {"latin": latin_font, "emoji": EMOJI_FONT}
+    pieces = []  # 相邻同字体的段合并为一个 run (如中文与全角标点)
+    for cls, chunk in segment_by_script("".join(r.text for r in runs)):
+        font = fonts.get(cls, cn_font)
+        if pieces and pieces[-1][0] == font:
+            pieces[-1][1] += chunk
+        else:
+            pieces.append([font, chunk])
+    if not pieces:
+        return
+    if len(runs) == 1:
+        first = runs[0]
+    else:
+        for r in runs:
+            para._p.remove(r._r)
+        first = para.add_run()
+    first.text = pieces[0][1]
+    set_run_font(first, pieces[0][0], pieces[0][0], size, color, bold)
+
+    # 其余段复制第一个 run 的 XML，只改文字和字体，避免逐个走 python-pptx 属性
+    prev = first._r
+    for font, chunk in pieces[1:]:
+        r = copy.deepcopy(first._r)
+        r.find(_QN_T).text = chunk
+        for el in r.find(_QN_RPR).iterchildren(*_QN_TYPEFACES):
+            el.set('typeface', font)
+        prev.addnext(r)
+        prev = r
+
+
+def set_paragraph_format(para, font_size, indent_chars=0, line_spacing=1.5, 
+                         space_before=0, space_after=0, is_title=False):
+    """
+    设置段落格式 (修复版)
+    使用 python-pptx 正确的属性和 XML 操作
+    """
+    # 段前段后 (直接设置)
+    para.space_before = Pt(space_before)
+    para.space_after = Pt(space_after)
+
+    # 行距 (直接设置倍数)
+    para.line_spacing = line_spacing
+
+    # 首行缩进 (通过 XML 设置)
+    if not is_title and indent_chars > 0:
+        try:
+            # 获取段落的 XML 元素
+            pPr = para._p.get_or_add_pPr()
+            # 计算缩进值 (EMU)
+            indent_emu = int(Pt(indent_chars * font_size))
+            # 设置 indent 属性
+            pPr.set('indent', str(indent_emu))
+        except Exception as e:
+            print(f"缩进设置警告: {e}")
+
+
+FIXED_ZIP_TIME = (1980, 1, 1, 0, 0, 0)
+FIXED_CORE_TIME = datetime.datetime(2000, 1, 1)
+
+
+def save_deterministic(prs, output_path):
+    """
+    保存为逐字节可复现的 pptx
+    固定 zip 条目时间戳、按名称排序部件 ([Content_Types].xml 必须在最前)、固定核心属性
+    修改时间取模板的创建时间 (模板没有时用固定值)，不会早于创建时间
+    """
+    cp = prs.core_properties
+    cp.modified = cp.created or FIXED_CORE_TIME
+    cp.last_modified_by = "大纲转PPT"
+    cp.revision = 1
+
+    buf = io.BytesIO()
+    prs.save(buf)
+    buf.seek(0)
+    with zipfile.ZipFile(buf) as src, zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+        names = sorted(src.namelist(), key=lambda n: (n != "[Content_Types].xml", n))
+        for name in names:
+            info = zipfile.ZipInfo(name, FIXED_ZIP_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            dst.writestr(info, src.read(name))
+
+
+MAX_LEVEL = 4
+
+
+def line_level(line: str) -> int:
+    """缩进层级: 每个 Tab 或 4 个空格算一级"""
+    level = 0
+    while line.startswith('\t') or line.startswith('    '):
+        level += 1
+        line = line[1:] if line.startswith('\t') else line[4:]
+    return level
+
+
+def split_blocks(text: str, sep: str = "---", clean_md: bool = True) -> list:
+    """按分页符切分大纲，可选清理 Markdown (批量导出时只做一次)"""
+    blocks = [b.strip() for b in text.split(sep) if b.strip()]
+    if clean_md:
+        blocks = [clean_markdown(b) for b in blocks]
+    return blocks
+
+
+def render_presentation(blocks: list, output_path: str, opts: dict, template=None) -> int:
+    """
+    按选项渲染已切分的大纲并保存，返回页数
+    template 可传入已预加载的模板 (文件对象)，否则按 opts["template_path"] 打开
+    """
+    cn_font = opts["cn_font"]
+    latin_font = opts["latin_font"]
+    title_size = opts["title_size"]
+    body_size = opts["body_size"]
+    indent = opts["indent"]
+    line_sp = opts["line_spacing"]
+    para_sp = opts["para_spacing"]
+    theme = THEMES.get(opts["theme"], THEMES["经典蓝"])
+    make_cover = opts["cover"]
+    make_toc = opts["toc"]
+    template_path = opts.get("template_path")
+
+    # 创建 PPT
+    if template is not None:
+        prs = Presentation(template)
+    elif template_path and os.path.exists(template_path):
+        prs = Presentation(template_path)
+    else:
+        prs = Presentation()
+        prs.slide_width = Inches(13.333)
+        prs.slide_height = Inches(7.5)
+
+    if not blocks:
+        raise ValueError("无有效内容")
+
+    slide_count = 0
+    toc_titles = []
+
+    # ===== 封面页 =====
+    if make_cover and blocks:
+        lines = [l.strip() for l in blocks[0].splitlines() if l.strip()]
+
+        slide = prs.slides.add_slide(prs.slide_layouts[0])
+
+        if lines and slide.shapes.title:
+            slide.shapes.title.text = lines[0]
+            for p in slide.shapes.title.text_frame.paragraphs:
+                p.alignment = PP_ALIGN.CENTER
+                set_paragraph_format(p, title_size + 8, 0, 1.2, 0, 0, True)
+                style_paragraph_runs(p, cn_font, latin_font, title_size + 8, theme["title_color"], True)
+
+        if len(lines) > 1 and len(slide.placeholders) > 1:
+            sub = slide.placeholders[1]
+            sub.text = "\n".join(lines[1:])
+            for p in sub.text_frame.paragraphs:
+                p.alignment = PP_ALIGN.CENTER
+                set_paragraph_format(p, body_size, 0, 1.5, 0, 0, True)
+                style_paragraph_runs(p, cn_font, latin_font, body_size, theme["body_color"])
+
+        blocks = blocks[1:]
+        slide_count += 1
+
+    # 收集目录
+    for block in blocks:
+        lines = [l.strip() for l in block.splitlines() if l.strip()]
+        if lines:
+            toc_titles.append(lines[0])
+
+    # ===== 目录页 =====
+    if make_toc and toc_titles:
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+
+        if slide.shapes.title:
+            slide.shapes.title.text = "目录"
+            for p in slide.shapes.title.text_frame.paragraphs:
+                set_paragraph_format(p, title_size, 0, 1.2, 0, 0, True)
+                style_paragraph_runs(p, cn_font, latin_font, title_size, theme["title_color"], True)
+
+        if len(slide.placeholders) > 1:
+            tf = slide.placeholders[1].text_frame
+            tf.clear()
+            for i, title in enumerate(toc_titles):
+                p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+                p.text = f"{i + 1}. {title}"
+                p.level = 0
+                set_paragraph_format(p, body_size, 0, line_sp, para_sp, para_sp)
+                style_paragraph_runs(p, cn_font, latin_font, body_size, theme["body_color"], True)
+
+        slide_count += 1
+
+    # ===== 内容页 =====
+    for block in blocks:
+        lines = [l for l in block.splitlines() if l.strip()]
+        if not lines:
+            continue
+
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+
+        # 标题
+        title_text = lines[0].strip()
+        if slide.shapes.title:
+            slide.shapes.title.text = title_text
+            for p in slide.shapes.title.text_frame.paragraphs:
+                set_paragraph_format(p, title_size, 0, 1.2, 0, 0, True)
+                style_paragraph_runs(p, cn_font, latin_font, title_size, theme["title_color"], True)
+
+        # 正文
+        body_lines = lines[1:]
+        if body_lines and len(slide.placeholders) > 1:
+            tf = slide.placeholders[1].text_frame
+            tf.clear()
+
+            first = True
+            for line in body_lines:
+                orig = line
+                line_stripped = line.strip()
+                if not line_stripped:
+                    continue
+
+                p = tf.paragraphs[0] if first else tf.add_paragraph()
+                first = False
+                p.text = line_stripped
+
+                # 缩进层级
+                p.level = min(line_level(orig), MAX_LEVEL)
+
+                # 段落格式
+                set_paragraph_format(p, body_size, indent, line_sp, para_sp, para_sp)
+
+                # 字体
+                style_paragraph_runs(p, cn_font, latin_font, body_size, theme["body_color"])
+
+        slide_count += 1
+
+    save_deterministic(prs, output_path)
+    return slide_count
+
+
+# ==================== 大纲检查 ====================
+MAX_BODY_LINES = 12
+_LIST_ITEM_RE = re.compile(r'^[ \t]*(?:[\*\-\+]|\d+\.)[ \t]+')
+_CITATION_RE = re.compile(r'\[(?:cite[^\]]*|\d+(?:\s*[,，\-–]\s*\d+)*)\](?!\()|【\d+[^】]*】')  # [2](url) 是链接
+
+
+def analyze_block(block: str):
+    """
+    检查一页的原始文本 (行号相对块起始，从 0 开始)
+    返回 (警告列表 [(行, 信息)], 统计 (标题行, 标题, 正文行数, 字数))
+    """
+    warnings = []
+    title_line = None
+    title = ""
+    body_lines = 0
+    chars = 0
+    for i, line in enumerate(block.split('\n')):
+        if not line.strip():
+            continue
+        if title_line is None:
+            title_line = i
+            title = line.strip().lstrip('#').strip()
+            if _LIST_ITEM_RE.match(line) or line_level(line) > 0:
+                warnings.append((i, f"缺少标题行，「{line.strip()[:20]}」将被用作标题"))
+        else:
+            body_lines += 1
+            chars += len(line.strip())
+            level = line_level(line)
+            if level > MAX_LEVEL:
+                warnings.append((i, f"缩进 {level} 级，超过 {MAX_LEVEL} 级会被压平"))
+        m = _CITATION_RE.search(line)
+        if m:
+            warnings.append((i, f"残留引用标记 {m.group()}"))
+    if body_lines > MAX_BODY_LINES:
+        warnings.append((title_line, f"正文 {body_lines} 行，建议拆分 (≤{MAX_BODY_LINES})"))
+    return warnings, (title_line, title, body_lines, chars)
+
+
+class OutlineAnalyzer(QObject):
+    """
+    后台检查线程: 只保留最新一次请求，未变化的块直接复用上次结果
+    analyzed(编号, 警告 [(行号, 信息)], 密度 [(页码, 行号, 标题, 正文行数, 字数)])
+    """
+
+    analyzed = pyqtSignal(int, list, list)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        self._generation = 0
+        self._stopped = False
+        self._cache = {}
+        self._thread = threading.Thread(target=self._run, name="OutlineAnalyzer", daemon=True)
+        self._thread.start()
+
+    def request(self, text, sep, cover, toc, clean_md=True) -> int:
+        with self._lock:
+            self._generation += 1
+            self._pending = (self._generation, text, sep, cover, toc, clean_md)
+        self._wake.set()
+        return self._generation
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(timeout=2)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            if self._stopped:
+                break
+            with self._lock:
+                job, self._pending = self._pending, None
+            if job is None:
+                continue
+            result = self._analyze(*job[1:])
+            if result is not None:
+                self.analyzed.emit(job[0], *result)
+
+    def _analyze(self, text, sep, cover, toc, clean_md=True):
+        warnings = []
+        stats = []
+        cache = {}
+        line = 0
+        sep_lines = sep.count('\n')
+        for n, piece in enumerate(text.split(sep)):
+            if n % 256 == 0 and self._pending is not None:
+                return None  # 已有更新的请求，放弃本次
+            if piece.strip():
+                key = (piece, clean_md)
+                res = cache.get(key) or self._cache.get(key)
+                if res is None:
+                    block_warnings, (title_line, title, body, chars) = analyze_block(piece)
+                    if clean_md:
+                        title = clean_markdown(title).strip()  # 与生成的幻灯片标题一致
+                    res = (block_warnings, (title_line, title, body, chars))
+                cache[key] = res
+                warnings.extend((line + i + 1, msg) for i, msg in res[0])
+                stats.append((line, res[1]))
+            line += piece.count('\n') + sep_lines
+        self._cache = cache
+
+        # 页码: 封面占第 1 页，目录页插在封面之后
+        density = []
+        first_content = 0
+        if cover and stats:
+            density.append((1, stats[0][0] + stats[0][1][0] + 1, *stats[0][1][1:]))
+            first_content = 1
+        offset = len(density) + (1 if toc and len(stats) > first_content else 0)
+        for k, (start, (title_line, title, body, chars)) in enumerate(stats[first_content:]):
+            density.append((offset + k + 1, start + title_line + 1, title, body, chars))
+        warnings.sort()
+        return warnings, density
+
+
+# ==================== 输出缓存 ====================
+class OutputCache:
+    """
+    按内容寻址的导出缓存
+    键 = 大纲文本 + 全部渲染选项 + 模板文件哈希；命中时直接复制已生成的 pptx
+    """
+
+    VERSION = 4  # 渲染逻辑变化时递增，使旧缓存失效
+
+    def __init__(self, directory, max_entries=200):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._file_hashes = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def file_hash(self, path):
+        """模板文件哈希 (按路径、大小、修改时间缓存)"""
+        if not path or not os.path.exists(path):
+            return ""
+        st = os.stat(path)
+        memo = (path, st.st_size, st.st_mtime_ns)
+        if memo not in self._file_hashes:
+            h = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            self._file_hashes[memo] = h.hexdigest()
+        return self._file_hashes[memo]
+
+    def key(self, text, opts) -> str:
+        settings = dict(opts)
+        # 同一模板换了路径不影响结果，只认内容
+        settings["template_path"] = self.file_hash(opts.get("template_path"))
+        payload = json.dumps({"v": self.VERSION, "text": text, "settings": settings},
+                             ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + ".pptx", base + ".json"
+
+    def fetch(self, key, output_path):
+        """命中则复制到 output_path 并返回页数，否则返回 None"""
+        pptx_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                count = json.load(f)["slides"]
+            shutil.copyfile(pptx_path, output_path)
+            os.utime(meta_path)  # 最近使用
+        except (OSError, ValueError, KeyError):
+            return None
+        return count
+
+    def store(self, key, output_path, count):
+        pptx_path, meta_path = self._paths(key)
+        try:
+            shutil.copyfile(output_path, pptx_path + ".tmp")
+            os.replace(pptx_path + ".tmp", pptx_path)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({"slides": count}, f)
+            self._prune()
+        except OSError as e:
+            print(f"缓存写入警告: {e}")
+
+    def _prune(self):
+        metas = [os.path.join(self.directory, n) for n in os.listdir(self.directory) if n.endswith(".json")]
+        if len(metas) <= self.max_entries:
+            return
+        metas.sort(key=os.path.getmtime)
+        for meta in metas[:len(metas) - self.max_entries]:
+            for path in (meta, meta[:-5] + ".pptx"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+# ==================== 批量变体导出 ====================
+_WORKER_BLOCKS = []
+_WORKER_TEMPLATES = {}
+
+
+def _matrix_worker_init(blocks, template_paths):
+    """工作进程初始化: 保存已清理的大纲，预加载模板"""
+    global _WORKER_BLOCKS
+    _WORKER_BLOCKS = blocks
+    for path in template_paths:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                _WORKER_TEMPLATES[path] = f.read()
+
+
+def _matrix_worker_render(output_path, opts):
+    t0 = time.perf_counter()
+    data = _WORKER_TEMPLATES.get(opts["template_path"])
+    template = io.BytesIO(data) if data else None
+    count = render_presentation(_WORKER_BLOCKS, output_path, opts, template)
+    return count, time.perf_counter() - t0
+
+
+def _safe_filename(name):
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', name).strip('_')
+
+
+class MatrixExportDialog(QDialog):
+    """批量变体导出设置: 模板 × 配色 × 字体"""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setWindowTitle("批量变体导出")
+        self.resize(560, 520)
+        layout = QVBoxLayout(self)
+
+        grid = QGridLayout()
+        self.template_list = self._make_list([])
+        self._add_template_item("默认模板", "", True)
+        if parent.template_path:
+            self._add_template_item(os.path.basename(parent.template_path), parent.template_path, True)
+        add_btn = QPushButton("添加模板...")
+        add_btn.clicked.connect(self._add_templates)
+        tpl_group = QGroupBox("📁 模板")
+        tpl_layout = QVBoxLayout(tpl_group)
+        tpl_layout.addWidget(self.template_list)
+        tpl_layout.addWidget(add_btn)
+        grid.addWidget(tpl_group, 0, 0)
+
+        self.theme_list = self._make_list(THEMES.keys(), parent.theme_combo.currentText())
+        grid.addWidget(self._wrap("🎨 配色", self.theme_list), 0, 1)
+        self.cn_font_list = self._make_list(parent.font_map.keys(), parent.font_combo.currentText())
+        grid.addWidget(self._wrap("中文字体", self.cn_font_list), 1, 0)
+        self.latin_font_list = self._make_list(parent.latin_font_map.keys(), parent.latin_font_combo.currentText())
+        grid.addWidget(self._wrap("英文/数字", self.latin_font_list), 1, 1)
+        layout.addLayout(grid)
+
+        form = QFormLayout()
+        dir_layout = QHBoxLayout()
+        self.dir_input = QLineEdit(os.path.expanduser("~"))
+        dir_layout.addWidget(self.dir_input, 1)
+        browse_btn = QPushButton("浏览")
+        browse_btn.setFixedWidth(60)
+        browse_btn.clicked.connect(self._browse_dir)
+        dir_layout.addWidget(browse_btn)
+        form.addRow("输出位置:", dir_layout)
+        self.name_input = QLineEdit("变体导出")
+        form.addRow("文件夹名:", self.name_input)
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, os.cpu_count() or 1)
+        self.workers_spin.setValue(min(4, os.cpu_count() or 1))
+        form.addRow("并行进程:", self.workers_spin)
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    @staticmethod
+    def _wrap(title, widget):
+        group = QGroupBox(title)
+        QVBoxLayout(group).addWidget(widget)
+        return group
+
+    @staticmethod
+    def _make_list(names, checked=None):
+        lst = QListWidget()
+        for name in names:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if name == checked else Qt.CheckState.Unchecked)
+            lst.addItem(item)
+        return lst
+
+    def _add_template_item(self, label, path, checked):
+        item = QListWidgetItem(label)
+        item.setData(Qt.ItemDataRole.UserRole, path)
+        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+        item.setCheckState(Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked)
+        item.setToolTip(path or "python-pptx 默认模板")
+        self.template_list.addItem(item)
+
+    def _add_templates(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "选择模板", "", "PowerPoint (*.pptx)")
+        for path in paths:
+            self._add_template_item(os.path.basename(path), path, True)
+
+    def _browse_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "输出位置", self.dir_input.text())
+        if path:
+            self.dir_input.setText(path)
+
+    @staticmethod
+    def _checked(lst, role=None):
+        items = [lst.item(i) for i in range(lst.count())]
+        items = [it for it in items if it.checkState() == Qt.CheckState.Checked]
+        values = [it.data(role) if role else it.text() for it in items]
+        return list(dict.fromkeys(values))
+
+    def selections(self) -> dict:
+        return {
+            "templates": self._checked(self.template_list, Qt.ItemDataRole.UserRole),
+            "themes": self._checked(self.theme_list),
+            "cn_fonts": self._checked(self.cn_font_list),
+            "latin_fonts": self._checked(self.latin_font_list),
+            "base_dir": self.dir_input.text() or os.path.expanduser("~"),
+            "name": _safe_filename(self.name_input.text()) or "变体导出",
+            "workers": self.workers_spin.value(),
+        }
+
+
+# ==================== PDF/PNG 转换 ====================
+# 常驻转换进程里运行的 UNO 客户端: 从 stdin 读任务，向 stdout 回结果 (每行一条 JSON)
+_UNO_HELPER = r'''
+import sys, json, time, uno
+from com.sun.star.beans import PropertyValue
+
+def prop(name, value):
+    p = PropertyValue()
+    p.Name, p.Value = name, value
+    return p
+
+local = uno.getComponentContext()
+resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+for _ in range(120):
+    try:
+        ctx = resolver.resolve("uno:pipe,name=%s;urp;StarOffice.ComponentContext" % sys.argv[1])
+        break
+    except Exception:
+        time.sleep(0.5)
+else:
+    sys.exit(1)
+desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+print(json.dumps({"ok": True}), flush=True)
+for line in sys.stdin:
+    job = json.loads(line)
+    try:
+        doc = desktop.loadComponentFromURL(uno.systemPathToFileUrl(job["src"]), "_blank", 0, (prop("Hidden", True),))
+        try:
+            doc.storeToURL(uno.systemPathToFileUrl(job["dst"]), (prop("FilterName", job["filter"]),))
+        finally:
+            doc.close(True)
+        print(json.dumps({"ok": True}), flush=True)
+    except Exception as e:
+        print(json.dumps({"ok": False, "error": str(e)}), flush=True)
+'''
+
+CONVERT_FILTERS = {"pdf": "impress_pdf_Export", "png": "impress_png_Export"}
+
+
+def find_office_binary():
+    """查找本机 LibreOffice，找不到返回 None"""
+    for name in ("soffice", "libreoffice"):
+        path = shutil.which(name)
+        if path:
+            return path
+    candidates = [
+        r"C:\Program Files\LibreOffice\program\soffice.exe",
+        r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+        "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+    ]
+    for path in candidates:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def find_uno_python(office):
+    """
+    查找可 import uno 的 Python (当前解释器、LibreOffice 自带、系统 python3)
+    每个候选最多等 15 秒，只应在后台线程调用
+    """
+    program_dir = os.path.dirname(os.path.realpath(office))
+    candidates = [
+        # 打包后的 exe 不是 Python 解释器，运行它只会再打开一个主窗口
+        None if getattr(sys, "frozen", False) else sys.executable,
+        os.path.join(program_dir, "python.exe"),
+        os.path.join(program_dir, "python"),
+        os.path.join(program_dir, "..", "Resources", "python"),
+        shutil.which("python3"),
+    ]
+    for exe in candidates:
+        if not exe or not os.path.exists(exe):
+            continue
+        try:
+            subprocess.run([exe, "-c", "import uno"], check=True, timeout=15,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return exe
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return None
+
+
+def _command(prog):
+    """命令可以是可执行文件路径，也可以是参数列表 (如 [python, 脚本])"""
+    return list(prog) if isinstance(prog, (list, tuple)) else [prog]
+
+
+def _kill_tree(proc):
+    """结束进程及其子进程 (soffice 会再启动 soffice.bin)"""
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        if sys.platform == 'win32':
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(proc.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+class ConverterError(Exception):
+    """转换失败；fatal 表示进程挂起或退出，需要重启"""
+
+    def __init__(self, message, fatal=False):
+        super().__init__(message)
+        self.fatal = fatal
+
+
+class _ConverterSlot:
+    """
+    一个常驻转换进程
+    有 UNO 时: 常驻 soffice + UNO 客户端，启动开销只付一次
+    无 UNO 时: 退化为每个任务单独调用 soffice --convert-to (各槽使用独立配置目录，可并行)
+    """
+
+    STARTUP_TIMEOUT = 90
+    MAX_JOBS = 200  # 处理一定数量后重启，避免长时间运行的内存增长
+
+    def __init__(self, index, office, uno_python, helper_path):
+        self.index = index
+        self.office = office
+        self.uno_python = uno_python
+        self.helper_path = helper_path
+        self.profile = tempfile.mkdtemp(prefix=f"pptgen_lo{index}_")
+        self._office_proc = None
+        self._helper_proc = None
+        self._lines = None
+        self._jobs = 0
+        self._generation = 0
+        self._children = []
+        self._closed = False
+        self._spawn_lock = threading.Lock()
+
+    def _popen_kwargs(self):
+        if sys.platform == 'win32':
+            return {"creationflags": subprocess.CREATE_NO_WINDOW}
+        return {"start_new_session": True}
+
+    def _spawn(self, args, **kwargs):
+        """启动并登记子进程；close() 之后不再启动，避免与关闭并发时留下孤儿进程"""
+        with self._spawn_lock:
+            if self._closed:
+                raise ConverterError("转换池已关闭")
+            proc = subprocess.Popen(args, **kwargs, **self._popen_kwargs())
+            self._children = [p for p in self._children if p.poll() is None] + [proc]
+        return proc
+
+    def _office_args(self):
+        return _command(self.office) + ["--headless", "--invisible", "--nologo", "--norestore",
+                "--nodefault", "--nolockcheck",
+                f"-env:UserInstallation={pathlib.Path(self.profile).as_uri()}"]
+
+    def _start(self):
+        self._generation += 1
+        pipe = f"pptgen_{os.getpid()}_{self.index}_{self._generation}"
+        self._office_proc = self._spawn(
+            self._office_args() + [f"--accept=pipe,name={pipe};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self._helper_proc = self._spawn(
+            _command(self.uno_python) + [self.helper_path, pipe],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', bufsize=1)
+        self._lines = queue.Queue()
+        threading.Thread(target=self._read_lines, args=(self._helper_proc, self._lines), daemon=True).start()
+        self._jobs = 0
+        self._read_result(self.STARTUP_TIMEOUT)
+
+    @staticmethod
+    def _read_lines(proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _read_result(self, timeout):
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise ConverterError("转换进程无响应", fatal=True)
+        if line is None:
+            raise ConverterError("转换进程已退出", fatal=True)
+        result = json.loads(line)
+        if not result.get("ok"):
+            raise ConverterError(result.get("error", "转换失败"))
+
+    def stop(self):
+        if self._helper_proc is not None:
+            try:
+                self._helper_proc.stdin.close()
+            except OSError:
+                pass
+        _kill_tree(self._helper_proc)
+        _kill_tree(self._office_proc)
+        self._helper_proc = self._office_proc = None
+
+    def close(self):
+        """不再启动新进程，并结束所有仍在运行的子进程 (含正在进行的 --convert-to)"""
+        with self._spawn_lock:
+            self._closed = True
+            children = [p for p in self._children if p.poll() is None]
+        for proc in children:
+            _kill_tree(proc)
+
+    def convert(self, src, dst, fmt, timeout):
+        """执行一次转换，超时或进程异常时抛出 ConverterError (调用方负责重启)"""
+        if not self.uno_python:
+            self._convert_once(src, dst, fmt, timeout)
+            return
+        if self._helper_proc is None or self._helper_proc.poll() is not None or self._jobs >= self.MAX_JOBS:
+            self.stop()
+            self._start()
+        job = {"src": os.path.abspath(src), "dst": os.path.abspath(dst), "filter": CONVERT_FILTERS[fmt]}
+        try:
+            # 保持 ASCII: 客户端按本机编码 (如 cp936) 读 stdin，中文路径用 \\u 转义
+            self._helper_proc.stdin.write(json.dumps(job) + "\n")
+            self._helper_proc.stdin.flush()
+        except OSError as e:
+            raise ConverterError(str(e), fatal=True)
+        self._jobs += 1
+        self._read_result(timeout)
+
+    def _convert_once(self, src, dst, fmt, timeout):
+        out_dir = tempfile.mkdtemp(prefix="pptgen_out_", dir=self.profile)
+        proc = self._spawn(
+            self._office_args() + ["--convert-to", fmt, "--outdir", out_dir, os.path.abspath(src)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_tree(proc)
+            raise ConverterError("转换进程无响应", fatal=True)
+        produced = os.path.join(out_dir, os.path.splitext(os.path.basename(src))[0] + "." + fmt)
+        if not os.path.exists(produced):
+            raise ConverterError("转换失败")
+        shutil.move(produced, dst)
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+class ConverterPool:
+    """
+    常驻本地转换进程池 (LibreOffice)
+    submit() 返回 Future；挂起的进程超时后被结束并重启；stats() 给出吞吐统计
+    office / uno_python 可指定命令 (路径或参数列表)，便于离线用替身测试；
+    uno_python 为 "auto" 时在后台线程里查找，为 None 时每个任务单独调用 soffice --convert-to
+    """
+
+    def __init__(self, size=2, timeout=120, office=None, uno_python="auto"):
+        self.office = office or find_office_binary()
+        self.timeout = timeout
+        self._jobs = queue.Queue()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"completed": 0, "failed": 0, "restarts": 0, "busy_seconds": 0.0}
+        self._started_at = time.perf_counter()
+        self._threads = []
+        self._slots = []
+        self._uno_python = uno_python
+        self._uno_ready = False
+        self._uno_lock = threading.Lock()
+        self._helper_path = None
+        if not self.office:
+            return
+
+        for i in range(size):
+            slot = _ConverterSlot(i, self.office, None, None)
+            t = threading.Thread(target=self._worker, args=(slot,), name=f"Converter-{i}", daemon=True)
+            self._slots.append(slot)
+            self._threads.append(t)
+            t.start()
+
+    def _resolve_uno(self):
+        """首个任务到来时在工作线程中查找 UNO Python 并写出客户端脚本"""
+        with self._uno_lock:
+            if not self._uno_ready:
+                if self._uno_python == "auto":
+                    self._uno_python = find_uno_python(self.office)
+                if self._uno_python:
+                    fd, self._helper_path = tempfile.mkstemp(prefix="pptgen_uno_", suffix=".py")
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.write(_UNO_HELPER)
+                self._uno_ready = True
+        return self._uno_python, self._helper_path
+
+    @property
+    def available(self):
+        return self.office is not None
+
+    def submit(self, src, fmt) -> Future:
+        """把 src 转为 fmt (pdf/png)，输出到同目录同名文件"""
+        future = Future()
+        if not self.available:
+            future.set_exception(ConverterError("未检测到 LibreOffice"))
+            return future
+        if self._stopping.is_set():
+            future.set_exception(ConverterError("转换池已关闭"))
+            return future
+        dst = os.path.splitext(src)[0] + "." + fmt
+        self._jobs.put((src, dst, fmt, future))
+        return future
+
+    def _worker(self, slot):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            src, dst, fmt, future = job
+            if self._stopping.is_set():
+                future.cancel()
+                continue
+            if not future.set_running_or_notify_cancel():
+                continue
+            t0 = time.perf_counter()
+            try:
+                slot.uno_python, slot.helper_path = self._resolve_uno()
+                slot.convert(src, dst, fmt, self.timeout)
+            except Exception as e:
+                fatal = not isinstance(e, ConverterError) or e.fatal
+                if fatal:
+                    slot.stop()  # 挂起或崩溃的进程下次使用时重启
+                with self._lock:
+                    self._stats["failed"] += 1
+                    self._stats["restarts"] += int(fatal)
+                    self._stats["busy_seconds"] += time.perf_counter() - t0
+                future.set_exception(e)
+                continue
+            with self._lock:
+                self._stats["completed"] += 1
+                self._stats["busy_seconds"] += time.perf_counter() - t0
+            future.set_result(dst)
+
+    def stats(self) -> dict:
+        with self._lock:
+            st = dict(self._stats)
+        elapsed = time.perf_counter() - self._started_at
+        done = st["completed"]
+        handled = done + st["failed"]
+        st["workers"] = len(self._slots)
+        st["pending"] = self._jobs.qsize()
+        st["avg_seconds"] = st["busy_seconds"] / handled if handled else 0.0
+        st["jobs_per_minute"] = done * 60.0 / elapsed if elapsed > 0 else 0.0
+        return st
+
+    def shutdown(self):
+        """取消排队的任务，结束正在进行的转换，等工作线程退出后再删除配置目录"""
+        self._stopping.set()
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job[3].cancel()
+        for _ in self._threads:
+            self._jobs.put(None)
+        for slot in self._slots:
+            slot.close()  # 正在等待的转换随即失败返回，工作线程取到 None 后退出
+        for t in self._threads:
+            t.join(timeout=5)
+        for slot in self._slots:
+            shutil.rmtree(slot.profile, ignore_errors=True)
+        if self._helper_path:
+            try:
+                os.remove(self._helper_path)
+            except OSError:
+                pass
+
+
 class DragDropTextEdit(QTextEdit):
     """支持拖拽的文本框"""
     def __init__(self, parent=None):
@@ -83,17 +1416,29 @@ class DragDropTextEdit(QTextEdit):
 class PPTGeneratorTool(QMainWindow):
     """主窗口"""
 
+    LINT_DELAY_MS = 400  # 停止输入后多久触发检查
+    LINT_MAX_ITEMS = 500  # 检查面板最多显示的条目数
+
+    orphan_found = pyqtSignal(object, str)  # 后台找到的遗留日志与恢复出的文本
+
     def __init__(self):
         super().__init__()
         self.settings = QSettings("PPTGenerator", "OutlineToPPT")
         self.dark_mode = False
         self.template_path = None
+        self.journal = None
+        self.converter_pool = None
+        self.analyzer = None
+        self._lint_gen = 0
+        self.output_cache = OutputCache(os.path.join(get_app_data_dir(), "cache"))
         self._init_ui()
         self._init_menu()
         self._init_toolbar()
         self._init_statusbar()
         self._load_settings()
         self._apply_theme()
+        self._init_autosave()
+        self._init_lint()
 
     def _init_ui(self):
         self.setWindowTitle("大纲转 PPT 工具 v1.1")
@@ -135,7 +1480,18 @@ class PPTGeneratorTool(QMainWindow):
         self.text_edit.textChanged.connect(self._update_stats)
         input_layout.addWidget(self.char_label)
 
-        left_layout.addWidget(input_group)
+        left_layout.addWidget(input_group, 1)
+
+        # 大纲检查结果
+        self.lint_tabs = QTabWidget()
+        self.lint_tabs.setMaximumHeight(170)
+        self.lint_list = QListWidget()
+        self.lint_list.itemClicked.connect(self._goto_lint_line)
+        self.lint_tabs.addTab(self.lint_list, "⚠️ 问题 (0)")
+        self.density_list = QListWidget()
+        self.density_list.itemClicked.connect(self._goto_lint_line)
+        self.lint_tabs.addTab(self.density_list, "📊 页面密度")
+        left_layout.addWidget(self.lint_tabs)
 
         # ===== 右侧：设置区 =====
         right = QWidget()
@@ -262,6 +1618,15 @@ class PPTGeneratorTool(QMainWindow):
         self.open_after_checkbox.setChecked(True)
         opt_layout.addWidget(self.open_after_checkbox)
 
+        self.pdf_checkbox = QCheckBox("同时导出 PDF")
+        self.png_checkbox = QCheckBox("同时导出 PNG 缩略图")
+        has_office = find_office_binary() is not None
+        for cb in (self.pdf_checkbox, self.png_checkbox):
+            cb.setEnabled(has_office)
+            if not has_office:
+                cb.setToolTip("未检测到 LibreOffice，无法转换")
+            opt_layout.addWidget(cb)
+
         opt_group.setLayout(opt_layout)
         right_layout.addWidget(opt_group)
 
@@ -316,6 +1681,11 @@ class PPTGeneratorTool(QMainWindow):
         save_act.triggered.connect(self._on_export)
         file_menu.addAction(save_act)
 
+        matrix_act = QAction("批量变体导出(&M)...", self)
+        matrix_act.setShortcut("Ctrl+M")
+        matrix_act.triggered.connect(self._on_matrix_export)
+        file_menu.addAction(matrix_act)
+
         file_menu.addSeparator()
         exit_act = QAction("退出(&Q)", self)
         exit_act.setShortcut("Ctrl+Q")
@@ -346,6 +1716,7 @@ class PPTGeneratorTool(QMainWindow):
         tb.addAction("📂 打开", self._open_file)
         tb.addAction("📋 模板", self._select_template)
         tb.addAction("💾 导出", self._on_export)
+        tb.addAction("🧩 批量", self._on_matrix_export)
         tb.addSeparator()
         tb.addAction("🗑️ 清空", lambda: self.text_edit.clear())
 
@@ -354,6 +1725,105 @@ class PPTGeneratorTool(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("就绪")
 
+    def _init_autosave(self):
+        directory = get_app_data_dir()
+        self.journal = AutosaveJournal.for_process(directory)
+        self.journal.start(self.text_edit.toPlainText())
+        self.journal.track(self.text_edit.document())
+        # 遗留日志可能很大，查找与重放放到后台线程，结果经信号回到 GUI 线程再询问
+        self.orphan_found.connect(self._offer_restore)
+        threading.Thread(target=self._find_orphan, args=(directory,), name="AutosaveRecover", daemon=True).start()
+
+    def _find_orphan(self, directory):
+        orphan = AutosaveJournal.claim_orphan(directory)
+        if orphan:
+            self.orphan_found.emit(*orphan)
+
+    def _offer_restore(self, orphan, recovered):
+        reply = QMessageBox.question(
+            self, "恢复内容",
+            f"检测到上次未正常退出时的大纲内容（{len(recovered)} 字符），是否恢复？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            self.text_edit.setPlainText(recovered)
+            self.status_bar.showMessage("已恢复未保存的内容")
+        orphan.close(discard=True)
+
+    def _init_lint(self):
+        self.analyzer = OutlineAnalyzer()
+        self.analyzer.analyzed.connect(self._on_lint_done)
+        self._lint_timer = QTimer(self)
+        self._lint_timer.setSingleShot(True)
+        self._lint_timer.setInterval(self.LINT_DELAY_MS)
+        self._lint_timer.timeout.connect(self._request_lint)
+        self.text_edit.textChanged.connect(self._lint_timer.start)
+        self.separator_input.textChanged.connect(self._lint_timer.start)
+        self.cover_checkbox.toggled.connect(self._lint_timer.start)
+        self.toc_checkbox.toggled.connect(self._lint_timer.start)
+        self.clean_md_checkbox.toggled.connect(self._lint_timer.start)
+        self._lint_timer.start()
+
+    def _request_lint(self):
+        """只在 GUI 线程取文本，切分与检查都在后台线程"""
+        self._lint_gen = self.analyzer.request(
+            self.text_edit.toPlainText(),
+            self.separator_input.text() or "---",
+            self.cover_checkbox.isChecked(),
+            self.toc_checkbox.isChecked(),
+            self.clean_md_checkbox.isChecked(),
+        )
+
+    def _on_lint_done(self, gen, warnings, density):
+        if gen != self._lint_gen:
+            return  # 文本已变化，等待新结果
+
+        self.lint_list.clear()
+        for line, msg in warnings[:self.LINT_MAX_ITEMS]:
+            item = QListWidgetItem(f"第 {line} 行: {msg}")
+            item.setData(Qt.ItemDataRole.UserRole, line)
+            self.lint_list.addItem(item)
+        if len(warnings) > self.LINT_MAX_ITEMS:
+            self.lint_list.addItem(f"…还有 {len(warnings) - self.LINT_MAX_ITEMS} 条")
+        self.lint_tabs.setTabText(0, f"⚠️ 问题 ({len(warnings)})")
+
+        self.density_list.clear()
+        for page, line, title, body, chars in density[:self.LINT_MAX_ITEMS]:
+            mark = "⚠️ " if body > MAX_BODY_LINES else ""
+            item = QListWidgetItem(f"{mark}第 {page} 页 (第 {line} 行) {title[:24]} — {body} 行 / {chars} 字")
+            item.setData(Qt.ItemDataRole.UserRole, line)
+            self.density_list.addItem(item)
+        if len(density) > self.LINT_MAX_ITEMS:
+            self.density_list.addItem(f"…还有 {len(density) - self.LINT_MAX_ITEMS} 页")
+
+        # 在编辑区给问题行加波浪下划线
+        doc = self.text_edit.document()
+        fmt = QTextCharFormat()
+        fmt.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+        fmt.setUnderlineColor(QColor("#e67e22"))
+        selections = []
+        for line in dict.fromkeys(line for line, _ in warnings[:self.LINT_MAX_ITEMS]):
+            block = doc.findBlockByNumber(line - 1)
+            if not block.isValid():
+                continue
+            sel = QTextEdit.ExtraSelection()
+            sel.cursor = QTextCursor(block)
+            sel.cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            sel.format = fmt
+            selections.append(sel)
+        self.text_edit.setExtraSelections(selections)
+
+    def _goto_lint_line(self, item):
+        line = item.data(Qt.ItemDataRole.UserRole)
+        if not line:
+            return
+        block = self.text_edit.document().findBlockByNumber(line - 1)
+        if block.isValid():
+            self.text_edit.setTextCursor(QTextCursor(block))
+            self.text_edit.ensureCursorVisible()
+            self.text_edit.setFocus()
+
     def _select_template(self):
         path, _ = QFileDialog.getOpenFileName(self, "选择模板", "", "PowerPoint (*.pptx)")
         if path:
@@ -379,6 +1849,8 @@ class PPTGeneratorTool(QMainWindow):
             self.theme_combo.setCurrentText(self.settings.value("theme", "经典蓝"))
             self.cover_checkbox.setChecked(self.settings.value("cover", True, type=bool))
             self.toc_checkbox.setChecked(self.settings.value("toc", False, type=bool))
+            self.pdf_checkbox.setChecked(self.settings.value("export_pdf", False, type=bool))
+            self.png_checkbox.setChecked(self.settings.value("export_png", False, type=bool))
             self.dark_mode = self.settings.value("dark_mode", False, type=bool)
             self.dark_act.setChecked(self.dark_mode)
             tpl = self.settings.value("template_path", "")
@@ -401,6 +1873,8 @@ class PPTGeneratorTool(QMainWindow):
             self.settings.setValue("theme", self.theme_combo.currentText())
             self.settings.setValue("cover", self.cover_checkbox.isChecked())
             self.settings.setValue("toc", self.toc_checkbox.isChecked())
+            self.settings.setValue("export_pdf", self.pdf_checkbox.isChecked())
+            self.settings.setValue("export_png", self.png_checkbox.isChecked())
             self.settings.setValue("dark_mode", self.dark_mode)
             self.settings.setValue("template_path", self.template_path or "")
         except:
@@ -469,95 +1943,6 @@ class PPTGeneratorTool(QMainWindow):
             except Exception as e:
                 QMessageBox.warning(self, "失败", str(e))
 
-    def _clean_markdown(self, text: str) -> str:
-        """彻底清理 Markdown"""
-        # 标题 # 符号
-        text = re.sub(r'^[ \t]*#{1,6}[ \t]+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^[ \t]*#{1,6}[ \t]*$', '', text, flags=re.MULTILINE)
-        
-        # 加粗斜体
-        text = re.sub(r'\*\*\*(.+?)\*\*\*', r'\1', text)
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'___(.+?)___', r'\1', text)
-        text = re.sub(r'__(.+?)__', r'\1', text)
-        text = re.sub(r'(?<![*])\*([^*\n]+?)\*(?![*])', r'\1', text)
-        text = re.sub(r'(?<![_])_([^_\n]+?)_(?![_])', r'\1', text)
-        
-        # 删除线、代码
-        text = re.sub(r'~~(.+?)~~', r'\1', text)
-        text = re.sub(r'`([^`\n]+?)`', r'\1', text)
-        
-        # 链接、图片
-        text = re.sub(r'\[([^\]]+?)\]\([^)]+?\)', r'\1', text)
-        text = re.sub(r'!\[([^\]]*?)\]\([^)]+?\)', r'\1', text)
-        
-        # 列表符号
-        text = re.sub(r'^[ \t]*[\*\-\+][ \t]+', '• ', text, flags=re.MULTILINE)
-        text = re.sub(r'^[ \t]*\d+\.[ \t]+', '', text, flags=re.MULTILINE)
-        
-        # 引用、代码块
-        text = re.sub(r'^[ \t]*>+[ \t]*', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^```.*$', '', text, flags=re.MULTILINE)
-        
-        # 多余空行
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text
-
-    def _set_run_font(self, run, cn_font, latin_font, size, color=None, bold=False):
-        """设置文字样式"""
-        run.font.size = Pt(size)
-        run.font.bold = bold
-        if color:
-            run.font.color.rgb = get_rgb_color(color)
-
-        try:
-            rPr = run._r.get_or_add_rPr()
-            
-            # 拉丁字体
-            latin = rPr.find(qn('a:latin'))
-            if latin is None:
-                latin = etree.SubElement(rPr, qn('a:latin'))
-            latin.set('typeface', latin_font)
-            
-            # 东亚字体
-            ea = rPr.find(qn('a:ea'))
-            if ea is None:
-                ea = etree.SubElement(rPr, qn('a:ea'))
-            ea.set('typeface', cn_font)
-            
-            # 复杂脚本
-            cs = rPr.find(qn('a:cs'))
-            if cs is None:
-                cs = etree.SubElement(rPr, qn('a:cs'))
-            cs.set('typeface', latin_font)
-        except:
-            run.font.name = cn_font
-
-    def _set_paragraph_format(self, para, font_size, indent_chars=0, line_spacing=1.5, 
-                               space_before=0, space_after=0, is_title=False):
-        """
-        设置段落格式 (修复版)
-        使用 python-pptx 正确的属性和 XML 操作
-        """
-        # 段前段后 (直接设置)
-        para.space_before = Pt(space_before)
-        para.space_after = Pt(space_after)
-        
-        # 行距 (直接设置倍数)
-        para.line_spacing = line_spacing
-
-        # 首行缩进 (通过 XML 设置)
-        if not is_title and indent_chars > 0:
-            try:
-                # 获取段落的 XML 元素
-                pPr = para._p.get_or_add_pPr()
-                # 计算缩进值 (EMU)
-                indent_emu = int(Pt(indent_chars * font_size))
-                # 设置 indent 属性
-                pPr.set('indent', str(indent_emu))
-            except Exception as e:
-                print(f"缩进设置警告: {e}")
-
     def _on_export(self):
         content = self.text_edit.toPlainText().strip()
         if not content:
@@ -588,6 +1973,7 @@ class PPTGeneratorTool(QMainWindow):
                 QMessageBox.information(self, "成功 ✓", msg)
             
             self.status_bar.showMessage(f"已导出: {path}")
+            self._convert_outputs([path])
         except PermissionError:
             QMessageBox.critical(self, "失败", "文件被占用，请关闭后重试！")
         except Exception as e:
@@ -595,6 +1981,42 @@ class PPTGeneratorTool(QMainWindow):
             import traceback
             traceback.print_exc()
 
+    def _convert_outputs(self, paths):
+        """导出后排队转换 PDF/PNG，不阻塞界面"""
+        formats = []
+        if self.pdf_checkbox.isEnabled() and self.pdf_checkbox.isChecked():
+            formats.append("pdf")
+        if self.png_checkbox.isEnabled() and self.png_checkbox.isChecked():
+            formats.append("png")
+        if not formats or not paths:
+            return
+        if self.converter_pool is None:
+            self.converter_pool = ConverterPool()
+        futures = [self.converter_pool.submit(path, fmt) for path in paths for fmt in formats]
+        self.status_bar.showMessage(f"正在转换 {'/'.join(f.upper() for f in formats)}...")
+
+        timer = QTimer(self)
+
+        def poll():
+            done = sum(f.done() for f in futures)
+            if done < len(futures):
+                if len(futures) > len(formats):
+                    self.status_bar.showMessage(f"正在转换 {done}/{len(futures)}...")
+                return
+            timer.stop()
+            timer.deleteLater()
+            errors = [str(f.exception()) for f in futures if not f.cancelled() and f.exception()]
+            st = self.converter_pool.stats()
+            summary = (f"累计 {st['completed']} 个, 平均 {st['avg_seconds']:.1f} 秒, "
+                       f"{st['jobs_per_minute']:.1f} 个/分钟, 重启 {st['restarts']} 次")
+            if errors:
+                self.status_bar.showMessage(f"转换失败: {errors[0]} | {summary}")
+            else:
+                self.status_bar.showMessage(f"转换完成 | {summary}")
+
+        timer.timeout.connect(poll)
+        timer.start(200)
+
     def _open_external(self, path):
         try:
             if sys.platform == 'win32':
@@ -606,152 +2028,182 @@ class PPTGeneratorTool(QMainWindow):
         except:
             pass
 
+    def _collect_options(self) -> dict:
+        """当前界面设置 -> 渲染选项"""
+        return {
+            "separator": self.separator_input.text() or "---",
+            "clean_md": self.clean_md_checkbox.isChecked(),
+            "cn_font": self.font_map.get(self.font_combo.currentText(), "Microsoft YaHei"),
+            "latin_font": self.latin_font_map.get(self.latin_font_combo.currentText(), "Times New Roman"),
+            "title_size": self.title_size_spin.value(),
+            "body_size": self.body_size_spin.value(),
+            "indent": self.indent_spin.value(),
+            "line_spacing": self.line_spacing_spin.value(),
+            "para_spacing": self.para_spacing_spin.value(),
+            "theme": self.theme_combo.currentText(),
+            "cover": self.cover_checkbox.isChecked(),
+            "toc": self.toc_checkbox.isChecked(),
+            "template_path": self.template_path or "",
+        }
+
     def _generate_ppt(self, text: str, output_path: str) -> int:
         """生成 PPT"""
-        sep = self.separator_input.text() or "---"
-        cn_font = self.font_map.get(self.font_combo.currentText(), "Microsoft YaHei")
-        latin_font = self.latin_font_map.get(self.latin_font_combo.currentText(), "Times New Roman")
-        title_size = self.title_size_spin.value()
-        body_size = self.body_size_spin.value()
-        indent = self.indent_spin.value()
-        line_sp = self.line_spacing_spin.value()
-        para_sp = self.para_spacing_spin.value()
-        theme = THEMES.get(self.theme_combo.currentText(), THEMES["经典蓝"])
-        clean_md = self.clean_md_checkbox.isChecked()
-        make_cover = self.cover_checkbox.isChecked()
-        make_toc = self.toc_checkbox.isChecked()
-
-        # 创建 PPT
-        if self.template_path and os.path.exists(self.template_path):
-            prs = Presentation(self.template_path)
-        else:
-            prs = Presentation()
-            prs.slide_width = Inches(13.333)
-            prs.slide_height = Inches(7.5)
-
-        blocks = [b.strip() for b in text.split(sep) if b.strip()]
-        if not blocks:
-            raise ValueError("无有效内容")
-
-        slide_count = 0
-        toc_titles = []
-
-        # ===== 封面页 =====
-        if make_cover and blocks:
-            block = blocks[0]
-            if clean_md:
-                block = self._clean_markdown(block)
-            lines = [l.strip() for l in block.splitlines() if l.strip()]
-
-            slide = prs.slides.add_slide(prs.slide_layouts[0])
-
-            if lines and slide.shapes.title:
-                slide.shapes.title.text = lines[0]
-                for p in slide.shapes.title.text_frame.paragraphs:
-                    p.alignment = PP_ALIGN.CENTER
-                    self._set_paragraph_format(p, title_size + 8, 0, 1.2, 0, 0, True)
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, title_size + 8, theme["title_color"], True)
-
-            if len(lines) > 1 and len(slide.placeholders) > 1:
-                sub = slide.placeholders[1]
-                sub.text = "\n".join(lines[1:])
-                for p in sub.text_frame.paragraphs:
-                    p.alignment = PP_ALIGN.CENTER
-                    self._set_paragraph_format(p, body_size, 0, 1.5, 0, 0, True)
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, body_size, theme["body_color"])
-
-            blocks = blocks[1:]
-            slide_count += 1
-
-        # 收集目录
-        for block in blocks:
-            tmp = self._clean_markdown(block) if clean_md else block
-            lines = [l.strip() for l in tmp.splitlines() if l.strip()]
-            if lines:
-                toc_titles.append(lines[0])
-
-        # ===== 目录页 =====
-        if make_toc and toc_titles:
-            slide = prs.slides.add_slide(prs.slide_layouts[1])
-
-            if slide.shapes.title:
-                slide.shapes.title.text = "目录"
-                for p in slide.shapes.title.text_frame.paragraphs:
-                    self._set_paragraph_format(p, title_size, 0, 1.2, 0, 0, True)
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, title_size, theme["title_color"], True)
-
-            if len(slide.placeholders) > 1:
-                tf = slide.placeholders[1].text_frame
-                tf.clear()
-                for i, title in enumerate(toc_titles):
-                    p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
-                    p.text = f"{i + 1}. {title}"
-                    p.level = 0
-                    self._set_paragraph_format(p, body_size, 0, line_sp, para_sp, para_sp)
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, body_size, theme["body_color"], True)
-
-            slide_count += 1
-
-        # ===== 内容页 =====
-        for block in blocks:
-            if clean_md:
-                block = self._clean_markdown(block)
-
-            lines = [l for l in block.splitlines() if l.strip()]
-            if not lines:
-                continue
-
-            slide = prs.slides.add_slide(prs.slide_layouts[1])
-
-            # 标题
-            title_text = lines[0].strip()
-            if slide.shapes.title:
-                slide.shapes.title.text = title_text
-                for p in slide.shapes.title.text_frame.paragraphs:
-                    self._set_paragraph_format(p, title_size, 0, 1.2, 0, 0, True)
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, title_size, theme["title_color"], True)
-
-            # 正文
-            body_lines = lines[1:]
-            if body_lines and len(slide.placeholders) > 1:
-                tf = slide.placeholders[1].text_frame
-                tf.clear()
-
-                first = True
-                for line in body_lines:
-                    orig = line
-                    line_stripped = line.strip()
-                    if not line_stripped:
-                        continue
-
-                    p = tf.paragraphs[0] if first else tf.add_paragraph()
-                    first = False
-                    p.text = line_stripped
+        opts = self._collect_options()
+        key = self.output_cache.key(text, opts)
+        count = self.output_cache.fetch(key, output_path)
+        if count is not None:
+            return count
+        blocks = split_blocks(text, opts["separator"], opts["clean_md"])
+        count = render_presentation(blocks, output_path, opts)
+        self.output_cache.store(key, output_path, count)
+        return count
+
+    def _on_matrix_export(self):
+        content = self.text_edit.toPlainText().strip()
+        if not content:
+            QMessageBox.warning(self, "提示", "请先输入内容！")
+            return
 
-                    # 缩进层级
-                    level = 0
-                    tmp = orig
-                    while tmp.startswith('\t') or tmp.startswith('    '):
-                        level += 1
-                        tmp = tmp[1:] if tmp.startswith('\t') else tmp[4:]
-                    p.level = min(level, 4)
+        dlg = MatrixExportDialog(self)
+        if dlg.exec() != QDialog.DialogCode.Accepted:
+            return
+        sel = dlg.selections()
+        if not (sel["templates"] and sel["themes"] and sel["cn_fonts"] and sel["latin_fonts"]):
+            QMessageBox.warning(self, "提示", "每一项至少选择一个！")
+            return
 
-                    # 段落格式
-                    self._set_paragraph_format(p, body_size, indent, line_sp, para_sp, para_sp)
+        self._save_settings()
+        out_dir = os.path.join(sel["base_dir"], sel["name"])
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+        except PermissionError:
+            QMessageBox.critical(self, "失败", f"没有权限创建输出文件夹:\n{out_dir}")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "失败", f"错误: {e}")
+            return
 
-                    # 字体
-                    for r in p.runs:
-                        self._set_run_font(r, cn_font, latin_font, body_size, theme["body_color"])
+        # 只解析、清理一次
+        base = self._collect_options()
+        t0 = time.perf_counter()
+        blocks = split_blocks(content, base["separator"], base["clean_md"])
+        parse_time = time.perf_counter() - t0
+        if not blocks:
+            QMessageBox.warning(self, "提示", "无有效内容")
+            return
 
-            slide_count += 1
+        jobs = []
+        used = set()
+        for tpl, theme, cn, latin in itertools.product(
+                sel["templates"], sel["themes"], sel["cn_fonts"], sel["latin_fonts"]):
+            opts = dict(base, template_path=tpl, theme=theme,
+                        cn_font=self.font_map[cn], latin_font=self.latin_font_map[latin])
+            tpl_name = os.path.splitext(os.path.basename(tpl))[0] if tpl else "默认模板"
+            name = _safe_filename(f"{tpl_name}_{theme}_{cn}_{latin}")
+            path = os.path.join(out_dir, name + ".pptx")
+            n = 1
+            while path in used:  # 不同目录下的同名模板
+                n += 1
+                path = os.path.join(out_dir, f"{name}_{n}.pptx")
+            used.add(path)
+            jobs.append((path, opts, (tpl_name, theme, cn, latin)))
+
+        progress = QProgressDialog("正在生成...", "取消", 0, len(jobs), self)
+        progress.setWindowTitle("批量变体导出")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        # 缓存命中直接复制；内容相同的任务 (如同一模板的两个副本) 只渲染一次
+        results = {}
+        todo = []
+        keys = {}
+        first_by_key = {}
+        duplicates = {}
+        t0 = time.perf_counter()
+        for path, opts, _ in jobs:
+            key = keys[path] = self.output_cache.key(content, opts)
+            if key in first_by_key:
+                duplicates[path] = first_by_key[key]
+                continue
+            first_by_key[key] = path
+            t1 = time.perf_counter()
+            count = self.output_cache.fetch(key, path)
+            if count is None:
+                todo.append((path, opts))
+            else:
+                results[path] = (count, time.perf_counter() - t1, "缓存")
+
+        if todo:
+            ctx = multiprocessing.get_context("spawn")
+            pool = ProcessPoolExecutor(max_workers=min(sel["workers"], len(todo)), mp_context=ctx,
+                                       initializer=_matrix_worker_init,
+                                       initargs=(blocks, sel["templates"]))
+            canceled = False
+            try:
+                pending = {pool.submit(_matrix_worker_render, path, opts): path for path, opts in todo}
+                while pending:
+                    done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        path = pending.pop(fut)
+                        try:
+                            count, elapsed = fut.result()
+                        except Exception as e:
+                            results[path] = e
+                            continue
+                        results[path] = (count, elapsed, "成功")
+                        self.output_cache.store(keys[path], path, count)
+                    progress.setValue(len(results))
+                    QApplication.processEvents()
+                    if progress.wasCanceled():
+                        canceled = True
+                        break
+            finally:
+                # 取消时不等正在渲染的进程结束，避免卡住界面
+                pool.shutdown(wait=not canceled, cancel_futures=True)
+
+        for path, src in duplicates.items():
+            if isinstance(results.get(src), tuple):
+                try:
+                    shutil.copyfile(src, path)
+                except PermissionError:
+                    results[path] = PermissionError("文件被占用")
+                    continue
+                except Exception as e:
+                    results[path] = e
+                    continue
+                results[path] = (results[src][0], 0.0, "重复")
+        total_time = time.perf_counter() - t0
+        progress.close()
+
+        report = os.path.join(out_dir, "timing_report.csv")
+        ok = sum(isinstance(res, tuple) for res in results.values())
+        try:
+            with open(report, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["文件", "模板", "配色", "中文字体", "英文/数字", "页数", "耗时(秒)", "状态"])
+                for path, _, labels in jobs:
+                    res = results.get(path)
+                    if isinstance(res, tuple):
+                        writer.writerow([os.path.basename(path), *labels, res[0], f"{res[1]:.3f}", res[2]])
+                    else:
+                        status = f"失败: {res}" if res else "已取消"
+                        writer.writerow([os.path.basename(path), *labels, "", "", status])
+                writer.writerow([])
+                writer.writerow(["解析+清理", "", "", "", "", "", f"{parse_time:.3f}", ""])
+                writer.writerow(["总耗时", "", "", "", "", "", f"{total_time:.3f}", f"{sel['workers']} 进程"])
+        except PermissionError:
+            QMessageBox.critical(self, "失败", "报告文件被占用，请关闭后重试！")
+            return
+        except Exception as e:
+            QMessageBox.critical(self, "失败", f"错误: {e}")
+            return
 
-        prs.save(output_path)
-        return slide_count
+        QMessageBox.information(
+            self, "批量导出完成",
+            f"成功 {ok}/{len(jobs)} 个，总耗时 {total_time:.1f} 秒\n\n{out_dir}\n报告: {os.path.basename(report)}"
+        )
+        self.status_bar.showMessage(f"批量导出: {out_dir}")
+        self._convert_outputs([path for path, _, _ in jobs if isinstance(results.get(path), tuple)])
 
     def _show_about(self):
         QMessageBox.about(
@@ -769,10 +2221,17 @@ class PPTGeneratorTool(QMainWindow):
 
     def closeEvent(self, event):
         self._save_settings()
+        if self.journal:
+            self.journal.close(discard=True)
+        if self.converter_pool:
+            self.converter_pool.shutdown()
+        if self.analyzer:
+            self.analyzer.stop()
         super().closeEvent(event)
 
 
 def main():
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
     app.setFont(QFont("Microsoft YaHei", 9))
@@ -0,0 +1,29 @@
+import importlib.util
+import os
+import pathlib
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SCRIPT = pathlib.Path(__file__).resolve().parent.parent / "md文件转pptx（测试成功版）.py"
+
+
+def _load_script():
+    # 脚本文件名不是合法模块名，按路径加载
+    spec = importlib.util.spec_from_file_location("md2pptx", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def md2pptx():
+    return _load_script()
+
+
+@pytest.fixture(scope="session")
+def qapp(md2pptx):
+    return md2pptx.QApplication.instance() or md2pptx.QApplication([])
@@ -0,0 +1,78 @@
+import os
+import sys
+import time
+
+import pytest
+
+# 替身转换程序: 带 --convert-to 时模拟 soffice 单次转换，否则模拟 UNO 客户端 (按行读取 JSON 任务)
+# 文件名含 hang 的任务一直挂起
+FAKE_CONVERTER = r'''
+import sys, os, json, time
+args = sys.argv[1:]
+if "--convert-to" in args:
+    fmt = args[args.index("--convert-to") + 1]
+    out_dir = args[args.index("--outdir") + 1]
+    src = args[-1]
+    if "hang" in os.path.basename(src):
+        time.sleep(600)
+    with open(os.path.join(out_dir, os.path.splitext(os.path.basename(src))[0] + "." + fmt), "w") as f:
+        f.write(fmt)
+else:
+    print(json.dumps({"ok": True}), flush=True)
+    for line in sys.stdin:
+        job = json.loads(line)
+        if "hang" in os.path.basename(job["src"]):
+            time.sleep(600)
+        with open(job["dst"], "w") as f:
+            f.write(job["filter"])
+        print(json.dumps({"ok": True}), flush=True)
+'''
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(600)"]
+
+
+@pytest.fixture(params=["常驻", "逐个"])
+def pool_kwargs(request, tmp_path):
+    fake = tmp_path / "fake_converter.py"
+    fake.write_text(FAKE_CONVERTER, encoding='utf-8')
+    if request.param == "常驻":
+        return dict(office=SLEEPER, uno_python=[sys.executable, str(fake)])
+    return dict(office=[sys.executable, str(fake)], uno_python=None)
+
+
+def _touch(path):
+    path.write_text("x")
+    return str(path)
+
+
+def test_hung_job_is_killed_and_slot_restarts(md2pptx, pool_kwargs, tmp_path):
+    src = _touch(tmp_path / "演示文稿.pptx")
+    hang = _touch(tmp_path / "hang.pptx")
+    pool = md2pptx.ConverterPool(size=1, timeout=3, **pool_kwargs)
+    try:
+        assert pool.submit(src, "pdf").result(timeout=30) == str(tmp_path / "演示文稿.pdf")
+        with pytest.raises(md2pptx.ConverterError) as exc:
+            pool.submit(hang, "pdf").result(timeout=30)
+        assert exc.value.fatal
+        assert pool.submit(src, "png").result(timeout=30)  # 重启后继续可用
+        st = pool.stats()
+        assert (st["completed"], st["failed"], st["restarts"]) == (2, 1, 1)
+    finally:
+        pool.shutdown()
+
+
+def test_shutdown_cancels_queue_and_leaves_no_processes(md2pptx, pool_kwargs, tmp_path):
+    pool = md2pptx.ConverterPool(size=1, timeout=60, **pool_kwargs)
+    futures = [pool.submit(_touch(tmp_path / f"hang_{i}.pptx"), "pdf") for i in range(3)]
+    time.sleep(1.5)  # 第一个任务已开始并挂起
+    pool.shutdown()
+
+    with pytest.raises(md2pptx.ConverterError):
+        futures[0].result(timeout=5)
+    assert all(f.cancelled() for f in futures[1:])
+    assert not any(t.is_alive() for t in pool._threads)
+    for slot in pool._slots:
+        assert all(p.poll() is not None for p in slot._children)
+        assert not os.path.exists(slot.profile)
+    with pytest.raises(md2pptx.ConverterError):
+        pool.submit(_touch(tmp_path / "after.pptx"), "pdf").result(timeout=5)
@@ -0,0 +1,77 @@
+import json
+import random
+import subprocess
+import sys
+
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QTextEdit
+
+
+def _write_journal(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+
+
+def _utf16_len(text):
+    return len(text.encode('utf-16-le')) // 2
+
+
+def test_roundtrip_with_astral_chars(md2pptx, qapp, tmp_path):
+    """含 emoji 等非 BMP 字符的编辑，经日志重放后应与编辑器内容一致"""
+    edit = QTextEdit()
+    journal = md2pptx.AutosaveJournal(str(tmp_path / "check.journal"))
+    journal.start("")
+    journal.track(edit.document())
+
+    cursor = edit.textCursor()
+    cursor.insertText("🚀 abc\nd")
+    cursor.setPosition(_utf16_len("🚀 ab"))
+    cursor.insertText("X😀")
+    cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor)
+    cursor.removeSelectedText()
+    cursor.movePosition(QTextCursor.MoveOperation.End)
+    cursor.insertText("\n𠀀中文 1️⃣ end")
+    cursor.setPosition(0)
+    cursor.movePosition(QTextCursor.MoveOperation.Right, QTextCursor.MoveMode.KeepAnchor, 3)
+    cursor.insertText("标题")
+    qapp.processEvents()
+
+    journal.close()
+    assert md2pptx.AutosaveJournal.recover(journal.path) == edit.toPlainText()
+
+
+def test_chunked_replay_matches_plain_replay(md2pptx, tmp_path, monkeypatch):
+    """编辑跨越多个块时，分块重放结果与逐字符串拼接一致"""
+    monkeypatch.setattr(md2pptx.AutosaveJournal, "REPLAY_CHUNK", 8)
+    rnd = random.Random(0)
+    alphabet = "ab 中文😀\n𠀀"
+    path = tmp_path / "fuzz.journal"
+    for _ in range(50):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 200)))
+        records = [{"t": "snap", "text": text}]
+        for _ in range(40):
+            a = rnd.randint(0, len(text))
+            b = min(len(text), a + rnd.randint(0, 30))
+            added = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 5)))
+            records.append({"t": "ed", "p": _utf16_len(text[:a]), "r": _utf16_len(text[a:b]), "a": added})
+            text = text[:a] + added + text[b:]
+        _write_journal(path, records)
+        assert md2pptx.AutosaveJournal.recover(str(path)) == (text if text.strip() else None)
+
+
+def test_claims_only_journals_of_exited_processes(md2pptx, tmp_path):
+    live = md2pptx.AutosaveJournal(str(tmp_path / "autosave-live.journal"))
+    live.start("还在编辑")
+    live.close()
+    live._lock.tryLock(0)  # 模拟窗口仍在运行: 日志保留且持有锁
+
+    dead = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                          capture_output=True, text=True).stdout.strip()
+    _write_journal(tmp_path / f"autosave-{dead}.journal", [{"t": "snap", "text": "崩溃前的内容"}])
+
+    orphan, text = md2pptx.AutosaveJournal.claim_orphan(str(tmp_path))
+    assert text == "崩溃前的内容"
+    assert md2pptx.AutosaveJournal.claim_orphan(str(tmp_path)) is None  # 已被认领，也不会认领运行中的日志
+    orphan.close(discard=True)
+    live._lock.unlock()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["autosave-live.journal"]
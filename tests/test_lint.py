@@ -0,0 +1,74 @@
+import pytest
+from pptx import Presentation
+
+OUTLINE = (
+    "# 封面标题\n"                                 # 1
+    "副标题\n"                                      # 2
+    "---\n"                                         # 3
+    "## 第一页\n"                                   # 4
+    "* 要点 [1]\n"                                  # 5
+    "---\n"                                         # 6
+    "* bullet **title**\n"                          # 7
+    "正文 [cite: 3]\n"                              # 8
+    "see [link](http://x) and [2](http://y)\n"      # 9
+)
+
+WARNINGS = [
+    (5, "残留引用标记 [1]"),
+    (7, "缺少标题行，「* bullet **title**」将被用作标题"),
+    (8, "残留引用标记 [cite: 3]"),
+]
+
+
+@pytest.fixture
+def analyzer(md2pptx, qapp):
+    analyzer = md2pptx.OutlineAnalyzer()
+    yield analyzer
+    analyzer.stop()
+
+
+def test_analyze_block_relative_lines(md2pptx):
+    warnings, stats = md2pptx.analyze_block("\n## 标题\n\t\t\t\t\t五级缩进\n【3】残留")
+    assert warnings == [(2, "缩进 5 级，超过 4 级会被压平"), (3, "残留引用标记 【3】")]
+    assert stats == (1, "标题", 2, len("五级缩进") + len("【3】残留"))
+
+
+def test_markdown_links_are_not_citations(md2pptx):
+    assert md2pptx.analyze_block("标题\nsee [link](http://x) and [2](http://y)")[0] == []
+    assert md2pptx.analyze_block("标题\n见 [2] 与 [3, 4]")[0] == [(1, "残留引用标记 [2]")]
+
+
+@pytest.mark.parametrize("cover, toc, pages", [
+    (True, True, [1, 3, 4]),     # 封面第 1 页，目录插在封面之后
+    (True, False, [1, 2, 3]),
+    (False, True, [2, 3, 4]),    # 无封面时目录占第 1 页
+    (False, False, [1, 2, 3]),
+])
+def test_line_and_page_numbers(analyzer, cover, toc, pages):
+    warnings, density = analyzer._analyze(OUTLINE, "---", cover, toc)
+    assert warnings == WARNINGS
+    assert [(page, line) for page, line, *_ in density] == list(zip(pages, [1, 4, 7]))
+
+
+def test_multiline_separator_offsets(analyzer):
+    text = OUTLINE.replace("---", "===\n===")
+    warnings, density = analyzer._analyze(text, "===\n===", True, True)
+    assert warnings == [(6, WARNINGS[0][1]), (9, WARNINGS[1][1]), (10, WARNINGS[2][1])]
+    assert [line for _, line, *_ in density] == [1, 5, 9]
+
+
+def test_density_titles_match_rendered_slides(md2pptx, analyzer, tmp_path):
+    opts = {
+        "separator": "---", "clean_md": True, "cn_font": "Microsoft YaHei", "latin_font": "Arial",
+        "title_size": 32, "body_size": 20, "indent": 2, "line_spacing": 1.5, "para_spacing": 6,
+        "theme": "经典蓝", "cover": True, "toc": True, "template_path": "",
+    }
+    md2pptx.render_presentation(md2pptx.split_blocks(OUTLINE), str(tmp_path / "out.pptx"), opts)
+    slides = Presentation(str(tmp_path / "out.pptx")).slides
+    _, density = analyzer._analyze(OUTLINE, "---", True, True, clean_md=True)
+    for page, _, title, *_ in density:
+        shape = next(s for s in slides[page - 1].shapes if s.has_text_frame)
+        assert shape.text_frame.text.split("\n")[0] == title
+
+    _, density = analyzer._analyze(OUTLINE, "---", True, True, clean_md=False)
+    assert density[-1][2] == "* bullet **title**"
@@ -0,0 +1,96 @@
+import shutil
+import time
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+OUTLINE = "# 年度汇报\n2024\n---\n## 市场概况\n* 营收增长 35%\n    * 同比 12.5 个百分点\n---\n## 下一步\n1. 上线 ERP 🚀"
+
+OPTS = {
+    "separator": "---",
+    "clean_md": True,
+    "cn_font": "Microsoft YaHei",
+    "latin_font": "Arial",
+    "title_size": 32,
+    "body_size": 20,
+    "indent": 2,
+    "line_spacing": 1.5,
+    "para_spacing": 6,
+    "theme": "经典蓝",
+    "cover": True,
+    "toc": True,
+    "template_path": "",
+}
+
+
+def _render(md2pptx, path, opts=OPTS):
+    blocks = md2pptx.split_blocks(OUTLINE, opts["separator"], opts["clean_md"])
+    md2pptx.render_presentation(blocks, str(path), opts)
+    return path.read_bytes()
+
+
+def _template(path, width):
+    prs = Presentation()
+    prs.slide_width = Inches(width)
+    prs.save(str(path))
+    return str(path)
+
+
+def test_render_is_byte_identical(md2pptx, tmp_path):
+    first = _render(md2pptx, tmp_path / "a.pptx")
+    time.sleep(2.1)  # zip 时间戳精度为 2 秒
+    assert _render(md2pptx, tmp_path / "b.pptx") == first
+
+    with zipfile.ZipFile(tmp_path / "a.pptx") as z:
+        assert z.namelist()[0] == "[Content_Types].xml"
+    cp = Presentation(str(tmp_path / "a.pptx")).core_properties
+    assert cp.modified == cp.created
+
+
+def test_key_follows_template_content_not_path(md2pptx, tmp_path):
+    cache = md2pptx.OutputCache(str(tmp_path / "cache"))
+    original = _template(tmp_path / "模板.pptx", 13.333)
+    moved = str(tmp_path / "副本" / "模板.pptx")
+    (tmp_path / "副本").mkdir()
+    shutil.copyfile(original, moved)
+
+    key = cache.key(OUTLINE, dict(OPTS, template_path=original))
+    assert cache.key(OUTLINE, dict(OPTS, template_path=moved)) == key
+    _template(tmp_path / "副本" / "模板.pptx", 10)
+    assert cache.key(OUTLINE, dict(OPTS, template_path=moved)) != key
+    assert cache.key(OUTLINE, dict(OPTS, template_path=original, theme="商务灰")) != key
+    assert cache.key(OUTLINE + " ", dict(OPTS, template_path=original)) != key
+
+
+def test_cache_hit_copies_stored_file(md2pptx, tmp_path):
+    cache = md2pptx.OutputCache(str(tmp_path / "cache"))
+    key = cache.key(OUTLINE, OPTS)
+    assert cache.fetch(key, str(tmp_path / "miss.pptx")) is None
+    data = _render(md2pptx, tmp_path / "out.pptx")
+    cache.store(key, str(tmp_path / "out.pptx"), 4)
+    assert cache.fetch(key, str(tmp_path / "hit.pptx")) == 4
+    assert (tmp_path / "hit.pptx").read_bytes() == data
+
+
+@pytest.fixture
+def window(md2pptx, qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(md2pptx, "get_app_data_dir", lambda: str(tmp_path))
+    win = md2pptx.PPTGeneratorTool()
+    yield win
+    win.journal.close(discard=True)
+    win.analyzer.stop()
+
+
+def test_key_ignores_ui_only_settings(window):
+    def key():
+        return window.output_cache.key(OUTLINE, window._collect_options())
+
+    before = key()
+    window._toggle_dark()
+    window.pdf_checkbox.setChecked(not window.pdf_checkbox.isChecked())
+    window.png_checkbox.setChecked(not window.png_checkbox.isChecked())
+    assert key() == before
+    window.body_size_spin.setValue(window.body_size_spin.value() + 1)
+    assert key() != before
@@ -0,0 +1,91 @@
+import gc
+import time
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+SEGMENT_BUDGET = 0.10   # 切分耗时 ≤ 原先逐 run 设置字体耗时的 10%
+RESTYLE_BUDGET = 1.75   # 切分 + 重建 run 的总耗时 ≤ 原先的 1.75 倍
+
+SAMPLES = [
+    "第1章 市场概况：2024年营收增长35%，同比提升12.5个百分点。",
+    "Q3 目标（Target）：完成 ERP 系统上线 🚀，覆盖 3 个事业部",
+    "“数字化转型”不是口号，而是 KPI —— 例如 NPS ≥ 60…",
+    "Plain ASCII bullet with numbers 1, 2, 3 and punctuation.",
+    "要点：纯中文的正文段落，没有英文和数字。",
+    "1️⃣ 第一步：梳理流程 ✅ 2️⃣ 第二步：上线试点",
+]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", []),
+    ("plain ascii", [("latin", "plain ascii")]),
+    ("第1章 概况", [("cjk", "第"), ("latin", "1"), ("cjk", "章 概况")]),
+    ("1️⃣ 第一", [("emoji", "1️⃣"), ("cjk", " 第一")]),
+    ("12️⃣", [("latin", "1"), ("emoji", "2️⃣")]),
+    ("品牌™️ 名", [("cjk", "品牌"), ("emoji", "™️"), ("cjk", " 名")]),
+    ("👨‍👩‍👧 家庭", [("emoji", "👨‍👩‍👧"), ("cjk", " 家庭")]),
+    ("Don’t stop “quoted” — now…", [("latin", "Don’t stop “quoted” — now…")]),
+    ("🚀!", [("emoji", "🚀"), ("latin", "!")]),
+    ("“数字化”不是口号", [("cjk", "“数字化”不是口号")]),
+    ("KPI —— 例如", [("latin", "KPI"), ("cjk", " —— 例如")]),
+    ("他说“OK”。", [("cjk", "他说“"), ("latin", "OK"), ("punct", "”。")]),
+])
+def test_segment_by_script(md2pptx, text, expected):
+    assert md2pptx.segment_by_script(text) == expected
+    assert "".join(chunk for _, chunk in expected) == text
+
+
+def test_style_paragraph_runs_assigns_fonts(md2pptx):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    p = slide.shapes.add_textbox(0, 0, Inches(1), Inches(1)).text_frame.paragraphs[0]
+    p.text = "第1章 🚀!"
+    md2pptx.style_paragraph_runs(p, "Microsoft YaHei", "Arial", 20, (51, 51, 51))
+    assert [(r.text, r.font.name) for r in p.runs] == [
+        ("第", "Microsoft YaHei"), ("1", "Arial"), ("章 ", "Microsoft YaHei"),
+        ("🚀", md2pptx.EMOJI_FONT), ("!", "Arial"),
+    ]
+
+
+def test_segmentation_within_budget(md2pptx, n=100_000, render_n=10_000):
+    """与未切分的旧做法 (p.text 后对每个 run 调 set_run_font) 逐段对比"""
+    def fill(tf, k, styled):
+        for i in range(10):
+            p = tf.paragraphs[0] if i == 0 else tf.add_paragraph()
+            p.text = SAMPLES[(k + i) % len(SAMPLES)]
+            if styled:
+                md2pptx.style_paragraph_runs(p, "Microsoft YaHei", "Times New Roman", 20, (51, 51, 51))
+            else:
+                for r in p.runs:
+                    md2pptx.set_run_font(r, "Microsoft YaHei", "Times New Roman", 20, (51, 51, 51))
+
+    # 两种做法按文本框交替计时 (每框 10 段，接近真实页面)，关闭 GC，减少噪声带来的偏差
+    prs = Presentation()
+    elapsed = {False: 0.0, True: 0.0}
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for b in range(render_n // 10):
+            if b % 25 == 0:
+                slide = prs.slides.add_slide(prs.slide_layouts[6])
+            for styled in (b % 2 == 0, b % 2 == 1):
+                tf = slide.shapes.add_textbox(0, 0, Inches(1), Inches(1)).text_frame
+                t0 = time.perf_counter()
+                fill(tf, b * 10, styled)
+                elapsed[styled] += time.perf_counter() - t0
+    finally:
+        if gc_enabled:
+            gc.enable()
+    baseline = elapsed[False] / render_n
+    styled = elapsed[True] / render_n
+
+    paras = [SAMPLES[i % len(SAMPLES)] for i in range(n)]
+    t0 = time.perf_counter()
+    for text in paras:
+        md2pptx.segment_by_script(text)
+    segment = (time.perf_counter() - t0) / n
+
+    assert segment <= SEGMENT_BUDGET * baseline, f"切分 {segment * 1e6:.2f} 微秒/段，旧做法 {baseline * 1e6:.1f}"
+    assert styled <= RESTYLE_BUDGET * baseline, f"重建 run {styled * 1e6:.1f} 微秒/段，旧做法 {baseline * 1e6:.1f}"